@@ -1,14 +1,25 @@
 import streamlit as st
-from excercise2 import agent_team
 from streamlit_lottie import st_lottie
 import requests
 
-# Load Lottie animation
+# Load Lottie animation (cached so reruns don't refetch it)
+@st.cache_data(ttl=86400, show_spinner=False)
 def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
+    # a slow, unreachable or non-JSON response just skips the animation instead of
+    # crashing the page (requests.JSONDecodeError is a RequestException)
+    try:
+        r = requests.get(url, timeout=3)
+        if r.status_code != 200:
+            return None
+        return r.json()
+    except requests.RequestException:
         return None
-    return r.json()
+
+# Build the agent team once per process and share it across sessions
+@st.cache_resource
+def get_team():
+    from financegpt import build_agent_team
+    return build_agent_team()
 
 st.set_page_config(page_title="Financial GPT", page_icon="💰", layout="centered")
 
@@ -29,6 +40,8 @@ lottie_json = load_lottieurl(lottie_url)
 if lottie_json:
     st_lottie(lottie_json, height=180)
 
+agent_team = get_team()
+
 # Horizontal radio buttons
 mode = st.radio(
     "🧭 Choose Focus Area:",
@@ -40,27 +53,33 @@ mode = st.radio(
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-# Input form
-with st.form("chat_form", clear_on_submit=True):
-    user_input = st.text_input("💬 Your Question", placeholder="e.g., What is compound interest?")
-    submitted = st.form_submit_button("Ask")
-
-if submitted and user_input:
-    st.session_state.messages.append({"role": "user", "content": user_input})
-    with st.spinner("Thinking..."):
-        response = agent_team.run(user_input)
-        st.session_state.messages.append({"role": "assistant", "content": response.content})
-        st.toast("📤 Answer generated!", icon="🤖")
+# Chat panel as a fragment: submitting the form reruns only this block,
+# leaving the header, animation and radio untouched
+@st.fragment
+def chat_panel():
+    # Input form
+    with st.form("chat_form", clear_on_submit=True):
+        user_input = st.text_input("💬 Your Question", placeholder="e.g., What is compound interest?")
+        submitted = st.form_submit_button("Ask")
 
-# Chat display with safe formatting
-for msg in st.session_state.messages:
-    if msg["role"] == "user":
-        st.markdown(f"🧑‍💼 **User:** {msg['content']}", unsafe_allow_html=True)
-    else:
-        st.markdown(f"🤖 **GPT:** {msg['content']}", unsafe_allow_html=True)
+    if submitted and user_input:
+        st.session_state.messages.append({"role": "user", "content": user_input})
+        with st.spinner("Thinking..."):
+            response = agent_team.run(user_input)
+            st.session_state.messages.append({"role": "assistant", "content": response.content})
+            st.toast("📤 Answer generated!", icon="🤖")
 
-# Expandable chat history
-with st.expander("🕓 View Full Chat History"):
+    # Chat display with safe formatting
     for msg in st.session_state.messages:
-        role = "You" if msg["role"] == "user" else "GPT"
-        st.markdown(f"**{role}**: {msg['content']}")
+        if msg["role"] == "user":
+            st.markdown(f"🧑‍💼 **User:** {msg['content']}", unsafe_allow_html=True)
+        else:
+            st.markdown(f"🤖 **GPT:** {msg['content']}", unsafe_allow_html=True)
+
+    # Expandable chat history
+    with st.expander("🕓 View Full Chat History"):
+        for msg in st.session_state.messages:
+            role = "You" if msg["role"] == "user" else "GPT"
+            st.markdown(f"**{role}**: {msg['content']}")
+
+chat_panel()
@@ -1,23 +1,32 @@
 import datetime
+import math
 import sqlite3
-import pandas as pd
-import yfinance as yf
-from textblob import TextBlob
-from dotenv import load_dotenv
+from contextlib import closing, contextmanager
+from functools import lru_cache
 
 from phi.tools import tool
 from phi.agent import Agent
-from phi.model.groq import Groq
-from phi.tools.duckduckgo import DuckDuckGo
-from phi.tools.yfinance import YFinanceTools
-from phi.storage.agent.sqlite import SqlAgentStorage
-from dateutil import parser as date_parser
-from dateutil.relativedelta import relativedelta
 
-# Load environment variables
-load_dotenv()
+# Heavy libraries (pandas, numpy, yfinance, dateutil, VADER, dotenv and the phi model/tool
+# integrations) are imported where they are used, so importing this module stays cheap.
+
+@lru_cache(maxsize=None)
+def _pd():
+    import pandas
+    return pandas
 
 # --- Utility: map company name to symbol ------------------------------------------------
+@lru_cache(maxsize=256)
+def _ticker(symbol: str):
+    import yfinance as yf
+    return yf.Ticker(symbol)
+
+@lru_cache(maxsize=1024)
+def _lookup_symbol(company: str) -> str:
+    # raises on a failed or symbol-less lookup; lru_cache doesn't store exceptions,
+    # so only successful Yahoo lookups are memoized
+    return _ticker(company).info["symbol"]
+
 def get_company_symbol(company: str) -> str:
     symbols = {
         "Infosys": "INFY", "Tesla": "TSLA",
@@ -26,26 +35,117 @@ def get_company_symbol(company: str) -> str:
     if company in symbols:
         return symbols[company]
     try:
-        info = yf.Ticker(company).info
-        return info.get("symbol", "Unknown")
+        return _lookup_symbol(company)
     except Exception:
         return "Unknown"
 
+# --- Utility: memoized date normalization -----------------------------------------------
+# The LLM repeats the same few month/date tokens, so cache the dateutil parse per token.
+# dateutil fills a missing year/day from its default, so today's date is part of the key
+# and an entry like "April" never outlives the day it was parsed on.
+@lru_cache(maxsize=128)
+def _parse_token(token: str, today: datetime.date, fmt: str) -> str:
+    from dateutil import parser as date_parser
+    default = datetime.datetime(today.year, today.month, today.day)
+    try:
+        return date_parser.parse(token, default=default).strftime(fmt)
+    except Exception:
+        # fall back to the raw token (assume already in the target format)
+        return token
+
+def _to_ym(token: str) -> str:
+    # normalize "April" → "2025-04"
+    return _parse_token(token, datetime.date.today(), "%Y-%m")
+
+def _to_date(date_str: str | None) -> str:
+    # if user passed a date or month, use that, otherwise today
+    # normalize "April 2025" → "2025-04-01"
+    if date_str:
+        return _parse_token(date_str, datetime.date.today(), "%Y-%m-%d")
+    return datetime.datetime.now().strftime("%Y-%m-%d")
+
+# --- Sentiment analyzer (VADER lexicon, built once) ------------------------------------
+@lru_cache(maxsize=None)
+def _sia():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
 # --- SQLite setup for transactions ------------------------------------------------------
-conn = sqlite3.connect("budget.db", check_same_thread=False)
-cursor = conn.cursor()
-cursor.execute(
-    """
-    CREATE TABLE IF NOT EXISTS transactions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        date TEXT,
-        type TEXT,
-        category TEXT,
-        amount REAL
-    )
-    """
+DB_FILE = "budget.db"
+# relaxed sync avoids an fsync per commit under WAL (journal_mode is persisted in the
+# file by _init_db); these two are per-connection settings, so every _db() applies them
+_PRAGMAS = (
+    "synchronous=NORMAL",
+    "temp_store=memory",
 )
-conn.commit()
+
+@contextmanager
+def _db():
+    # a short-lived connection per tool call, closed on exit. Streamlit starts a new
+    # script thread on every rerun, so a connection kept per thread would leak one per
+    # rerun; opening a local SQLite file is cheap next to the LLM round-trip.
+    with closing(sqlite3.connect(DB_FILE)) as conn:
+        for pragma in _PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        yield conn
+
+def _init_db(conn: sqlite3.Connection) -> None:
+    # WAL lets readers and a writer work concurrently and is stored in the database file
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            type TEXT,
+            category TEXT,
+            amount REAL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_type_cat_date ON transactions(type, category, date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_date ON transactions(date)")
+    # covers the investment LIKE scan + GROUP BY category without touching the table rows
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_cat ON transactions(category, amount)")
+    # categories are stored trimmed + lowercase; bring rows written before that into line
+    # so e.g. "Groceries" and "groceries" don't show up as separate breakdown lines
+    conn.execute(
+        "UPDATE transactions SET category = lower(trim(category)) "
+        "WHERE category != lower(trim(category))"
+    )
+    conn.commit()
+
+with _db() as _conn:
+    _init_db(_conn)
+
+def _month_range(ym: str) -> tuple[str, str] | None:
+    # "2025-04" → ("2025-04", "2025-05"); dates are stored as YYYY-MM-DD, so plain string
+    # comparison on this half-open range selects exactly that month
+    if len(ym) != 7 or ym[4] != "-" or not (ym[:4] + ym[5:]).isdigit():
+        return None
+    year, month = int(ym[:4]), int(ym[5:])
+    if not 1 <= month <= 12:
+        return None
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return ym, f"{year:04d}-{month:02d}"
+
+def _has_rows(conn: sqlite3.Connection) -> bool:
+    # cheap existence check so empty-table paths never build a DataFrame
+    return conn.execute("SELECT 1 FROM transactions LIMIT 1").fetchone() is not None
+
+def _format_breakdown(rows: list[tuple[str, float]]) -> str:
+    # fixed-width "category  amount" table for the few rows a GROUP BY category returns
+    header = f"{'category':<20}{'amount':>12}"
+    return "\n".join([header] + [f"{str(c):<20}{a:>12.2f}" for c, a in rows])
+
+def _parse_num(value) -> float | None:
+    # the LLM often sends numbers as strings like "5,000", "$250" or "6.5%";
+    # returns None for anything that isn't a finite number (including None)
+    try:
+        number = float(str(value).replace(",", "").replace("$", "").replace("%", "").strip())
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
 
 # --- Tools -------------------------------------------------------------------------------
 
@@ -56,24 +156,61 @@ def add_transaction(
     amount: float,
     date: str | None = None  # new optional param
 ) -> str:
-    # if user passed a date or month, use that, otherwise today
-    if date:
-        # try to parse “April 2025” → “2025-04-01”
-        try:
-            dt = date_parser.parse(date)
-            date_str = dt.strftime("%Y-%m-%d")
-        except:
-            date_str = date  # assume already “YYYY-MM-DD”
-    else:
-        date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-
-    cursor.execute(
-        "INSERT INTO transactions (date, type, category, amount) VALUES (?, ?, ?, ?)",
-        (date_str, type.lower(), category, amount)
-    )
-    conn.commit()
+    date_str = _to_date(date)
+    category = category.strip().lower()
+
+    with _db() as conn:
+        conn.execute(
+            "INSERT INTO transactions (date, type, category, amount) VALUES (?, ?, ?, ?)",
+            (date_str, type.lower(), category, amount)
+        )
+        conn.commit()
     return f"Recorded {type.title()} of ${amount:.2f} under '{category}' on {date_str}."
 
+@tool
+def add_transactions(rows: list[dict]) -> str:
+    """
+    Record several transactions at once. Each row needs type, category and amount,
+    plus an optional date; all rows are written in a single commit.
+    """
+    if not rows:
+        return "No transactions provided."
+
+    # validate the whole batch first: rows aren't typed by the tool signature like
+    # add_transaction's arguments are, so one bad row rejects the batch
+    data, errors = [], []
+    for i, r in enumerate(rows, start=1):
+        if not isinstance(r, dict):
+            errors.append(f"row {i}: not an object")
+            continue
+        missing = [k for k in ("type", "category") if not str(r.get(k) or "").strip()]
+        if missing:
+            errors.append(f"row {i}: missing {' and '.join(missing)}")
+            continue
+        amount = _parse_num(r.get("amount"))
+        if amount is None:
+            errors.append(f"row {i}: amount {r.get('amount')!r} is not a number")
+            continue
+        data.append((
+            _to_date(r.get("date")),
+            str(r["type"]).strip().lower(),
+            str(r["category"]).strip().lower(),
+            amount,
+        ))
+    if errors:
+        return "No transactions recorded. Fix these rows and retry:\n" + "\n".join(errors)
+
+    with _db() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (date, type, category, amount) VALUES (?, ?, ?, ?)",
+            data
+        )
+        conn.commit()
+    return "\n".join(
+        f"Recorded {type_.title()} of ${amount:.2f} under '{category}' on {date_str}."
+        for date_str, type_, category, amount in data
+    )
+
 
 @tool
 def list_transactions() -> str:
@@ -81,20 +218,20 @@ def list_transactions() -> str:
     Return a table of all transactions including their internal ID,
     date, type, category, and amount.
     """
-    df = pd.read_sql_query("SELECT * FROM transactions", conn)
-    if df.empty:
-        return "No transactions recorded yet."
-    # show only first 100 rows if too large
-    df = df[['id','date','type','category','amount']]
-    return df.to_string(index=False)
+    with _db() as conn:
+        if not _has_rows(conn):
+            return "No transactions recorded yet."
+        df = _pd().read_sql_query("SELECT id, date, type, category, amount FROM transactions", conn)
+        return df.to_string(index=False)
 
 @tool
 def delete_transaction(record_id: int) -> str:
     """
     Delete a single transaction by its ID.
     """
-    cursor.execute("DELETE FROM transactions WHERE id = ?", (record_id,))
-    conn.commit()
+    with _db() as conn:
+        conn.execute("DELETE FROM transactions WHERE id = ?", (record_id,))
+        conn.commit()
     return f"Deleted transaction with id {record_id}."
 
 @tool
@@ -102,8 +239,9 @@ def clear_transactions() -> str:
     """
     Delete all transactions and start fresh.
     """
-    cursor.execute("DELETE FROM transactions")
-    conn.commit()
+    with _db() as conn:
+        conn.execute("DELETE FROM transactions")
+        conn.commit()
     return "All transactions have been cleared."
 
 
@@ -113,51 +251,93 @@ def get_budget_summary(months: list[str] = None) -> str:
     Summarize income & expenses for one or more YYYY-MM months.
     If months is None: all-time.
     """
-    df = pd.read_sql_query("SELECT * FROM transactions", conn)
-    if df.empty:
-        return "No transactions recorded yet."
-
-    df['date'] = pd.to_datetime(df['date'])
-    if months:
-        # normalize input like ["April","May"] → ["2025-04","2025-05"]
-        normalized = []
-        for m in months:
-            try:
-                dt = date_parser.parse(m)
-                normalized.append(dt.strftime("%Y-%m"))
-            except:
-                # if already YYYY-MM
-                normalized.append(m)
-        df = df[df['date'].dt.strftime("%Y-%m").isin(normalized)]
-
-    total_inc = df[df['type']=="income"]['amount'].sum()
-    total_exp = df[df['type']=="expense"]['amount'].sum()
-    balance   = total_inc - total_exp
-
-    label = ", ".join(months) if months else "all time"
-    text  = f"📊 Budget Summary for {label}:\n\n"
-    text += f"• Income:  ${total_inc:.2f}\n"
-    text += f"• Expenses:${total_exp:.2f}\n"
-    text += f"• Balance: ${balance:.2f}\n\n"
-
-    brkd = df[df['type']=="expense"].groupby('category')['amount'].sum().reset_index()
-    text += "Expense Breakdown:\n" + brkd.to_string(index=False)
-    return text
+    with _db() as conn:
+        if not _has_rows(conn):
+            return "No transactions recorded yet."
+
+        where, params = "", []
+        if months:
+            # normalize input like ["April","May"] → ["2025-04","2025-05"]
+            normalized = [_to_ym(m) for m in months]
+            ranges = [r for r in map(_month_range, normalized) if r]
+            # half-open date ranges per month, so SQLite can search idx_tx_date
+            where  = " AND (" + (" OR ".join(["(date >= ? AND date < ?)"] * len(ranges)) or "0") + ")"
+            params = [d for r in ranges for d in r]
+
+        # let SQLite filter and aggregate so only the totals reach Python
+        totals = dict(conn.execute(
+            f"SELECT type, SUM(amount) FROM transactions WHERE 1=1{where} GROUP BY type",
+            params
+        ).fetchall())
+        total_inc = totals.get("income") or 0.0
+        total_exp = totals.get("expense") or 0.0
+        balance   = total_inc - total_exp
+
+        label = ", ".join(months) if months else "all time"
+        text  = f"📊 Budget Summary for {label}:\n\n"
+        text += f"• Income:  ${total_inc:.2f}\n"
+        text += f"• Expenses:${total_exp:.2f}\n"
+        text += f"• Balance: ${balance:.2f}\n\n"
+
+        brkd = conn.execute(
+            "SELECT category, TOTAL(amount) FROM transactions "
+            f"WHERE type = 'expense'{where} GROUP BY category",
+            params
+        ).fetchall()
+        text += "Expense Breakdown:\n" + _format_breakdown(brkd)
+        return text
+
+_LOAN_MIN_KEYS = ("min", "min_payment", "minimum_payment")
+
+def _num(value) -> float:
+    # lenient variant for display: unparseable values show as 0
+    number = _parse_num(value)
+    return 0.0 if number is None else number
+
+def _loan_min(loan: dict) -> float:
+    return _num(next((loan[k] for k in _LOAN_MIN_KEYS if k in loan), 0))
+
+# sort keys per repayment strategy: avalanche = highest rate first, snowball = smallest balance first
+_LOAN_KEYS = {
+    "avalanche": lambda r: -_num(r.get("rate", 0)),
+    "snowball":  lambda r: _num(r.get("balance", 0)),
+}
 
 @tool
 def calculate_loan_repayment(loans: list[dict], strategy: str = "avalanche") -> str:
-    df = pd.DataFrame(loans)
-    if strategy.lower() == "avalanche":
-        df = df.sort_values(by="rate", ascending=False)
-    else:
-        df = df.sort_values(by="balance")
-    text = f"Repayment Strategy: {strategy.title()}\n\n" + df.to_string(index=False)
+    # a handful of loans: plain sorted() + f-strings beat building a DataFrame
+    # accept phrasings like "Snowball method"; anything else defaults to avalanche
+    strategy = "snowball" if "snowball" in strategy.lower() else "avalanche"
+    rows   = sorted(loans, key=_LOAN_KEYS[strategy])
+    known  = {"name", "balance", "rate", *_LOAN_MIN_KEYS}
+    header = f"{'name':<15}{'balance':>12}{'rate':>8}{'min':>8}"
+    lines  = []
+    for r in rows:
+        line = (
+            f"{str(r.get('name', '')):<15}{_num(r.get('balance', 0)):>12.2f}"
+            f"{_num(r.get('rate', 0)):>8.2f}{_loan_min(r):>8.2f}"
+        )
+        # keep any other details the LLM passed along instead of dropping them
+        extras = ", ".join(f"{k}={v}" for k, v in r.items() if k not in known)
+        lines.append(f"{line}  {extras}" if extras else line)
+    text = f"Repayment Strategy: {strategy.title()}\n\n{header}\n" + "\n".join(lines)
     text += "\n\nTip: Pay minimums on all loans, then put extra toward the top loan."
     return text
 
 @tool
 def inflation_adjusted_value(amount: float, years: int, inflation_rate: float = 3.0) -> str:
-    adjusted = amount / ((1 + inflation_rate/100) ** years)
+    if years < 0:
+        return "Years must be non-negative."
+    if inflation_rate <= -100:
+        return "Inflation rate must be greater than -100%."
+    # extreme rates/horizons overflow the factor or underflow it to 0.0
+    try:
+        factor = math.pow(1 + inflation_rate/100.0, years)
+    except OverflowError:
+        factor = math.inf
+    if factor == 0 or math.isinf(factor):
+        return "That rate and horizon are too extreme to compute; try fewer years or a smaller rate."
+    adjusted = amount / factor
     return f"${amount:.2f} will be worth approximately ${adjusted:.2f} in {years} years at {inflation_rate:.1f}% inflation." 
 
 @tool
@@ -182,8 +362,13 @@ def calculate_net_worth(assets: dict, liabilities: dict) -> str:
 def analyze_sentiment(headlines: list[str]) -> str:
     if not headlines:
         return "No headlines provided."
-    scores = [TextBlob(h).sentiment.polarity for h in headlines]
-    avg = sum(scores) / len(scores)
+    import numpy as np
+    sia = _sia()
+    scores = np.fromiter(
+        (sia.polarity_scores(h)['compound'] for h in headlines),
+        dtype=np.float64, count=len(headlines)
+    )
+    avg = float(scores.mean())
     mood = "Positive" if avg > 0.2 else "Negative" if avg < -0.2 else "Neutral"
     return f"Overall Sentiment: {mood} (avg polarity: {avg:.2f})"
 
@@ -192,243 +377,288 @@ def get_investment_summary() -> str:
     """
     Summarize all logged 'investment' expenses, grouped by category.
     """
-    df = pd.read_sql_query("SELECT * FROM transactions", conn)
-    if df.empty:
-        return "No transactions recorded yet."
-    inv = df[df['category'].str.contains("investment", case=False, na=False)]
-    if inv.empty:
-        return "No investment transactions found."
-    total = inv['amount'].sum()
-    brkd  = inv.groupby('category')['amount'].sum().reset_index()
-    text  = f"💰 Total Invested: ${total:.2f}\n\nBreakdown:\n" + brkd.to_string(index=False)
-    return text
+    with _db() as conn:
+        if not _has_rows(conn):
+            return "No transactions recorded yet."
+        # LIKE is case-insensitive for ASCII, matching the old str.contains(case=False)
+        brkd = conn.execute(
+            "SELECT category, TOTAL(amount) FROM transactions "
+            "WHERE category LIKE '%investment%' GROUP BY category"
+        ).fetchall()
+        if not brkd:
+            return "No investment transactions found."
+        total = sum(amount for _, amount in brkd)
+        text  = f"💰 Total Invested: ${total:.2f}\n\nBreakdown:\n" + _format_breakdown(brkd)
+        return text
 
 @tool
 def list_investments() -> str:
     """
     Show raw investment rows with date, category, amount & id.
     """
-    df = pd.read_sql_query("SELECT * FROM transactions", conn)
-    if df.empty:
-        return "No transactions recorded yet."
-    inv = df[df['category'].str.contains("investment", case=False, na=False)]
-    if inv.empty:
-        return "No investments found."
-    return inv[['id','date','category','amount']].to_string(index=False)
-
-# --- Agents --------------------------------------------------------------------------------
-
-web_agent = Agent(
-    name="Web Agent",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    tools=[DuckDuckGo()],
-    instructions=[
-        "Identify factual questions requiring web research (e.g. ‘latest news’, ‘benefits of X’)",
-        "Disambiguate requests (e.g., company names vs. product names) by asking clarifying questions if unclear.",
-        "Perform DuckDuckGo search, gather up to 5 reputable sources (.gov, .edu, major media)",
-        "Synthesize into 2–4 bullet points, citing each source URL.",
-        "Handle rephrased or slang queries gracefully by mapping synonyms and paraphrases."
-        "If the question not understood, ask to write the question again",
-        "Keep answers succinct and up-to-date."
-    ],
-    show_tool_calls=False,
-    markdown=True
+    with _db() as conn:
+        if not _has_rows(conn):
+            return "No transactions recorded yet."
+        inv = _pd().read_sql_query(
+            "SELECT id, date, category, amount FROM transactions "
+            "WHERE category LIKE '%investment%'",
+            conn
+        )
+        if inv.empty:
+            return "No investments found."
+        return inv.to_string(index=False)
+
+# --- Agent instructions --------------------------------------------------------------------
+
+WEB_INSTRUCTIONS = (
+    "Identify factual questions requiring web research (e.g. ‘latest news’, ‘benefits of X’)",
+    "Disambiguate requests (e.g., company names vs. product names) by asking clarifying questions if unclear.",
+    "Perform DuckDuckGo search, gather up to 5 reputable sources (.gov, .edu, major media)",
+    "Synthesize into 2–4 bullet points, citing each source URL.",
+    "Handle rephrased or slang queries gracefully by mapping synonyms and paraphrases."
+    "If the question not understood, ask to write the question again",
+    "Keep answers succinct and up-to-date."
 )
 
-finance_agent = Agent(
-    name="Finance Agent",
-    role="Get stock prices and analyst recommendations",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    tools=[YFinanceTools(stock_price=True, analyst_recommendations=True, company_info=True)],
-    instructions=[
-        "Interpret various phrasings (e.g. 'NVDA quote', 'price of Nvidia') and confirm ticker if ambiguous.",
-        "Display latest price, % change, volume in a table; summarize analyst ratings with clear labels.",
-        "Detect stock or company data requests (prices, ratings, metrics)",
-        "Present in a table: price, % change, volume, consensus ratings",
-        "If user asks for historical or specific periods, fetch data accordingly and explain trends.",
-        "If business overview requested, give a 2-3 sentence summary.",
-        "Offer brief business summary when asked (sector, market cap, key products)."  
-    ],
-    show_tool_calls=False,
-    markdown=True
+FINANCE_INSTRUCTIONS = (
+    "Interpret various phrasings (e.g. 'NVDA quote', 'price of Nvidia') and confirm ticker if ambiguous.",
+    "Display latest price, % change, volume in a table; summarize analyst ratings with clear labels.",
+    "Detect stock or company data requests (prices, ratings, metrics)",
+    "Present in a table: price, % change, volume, consensus ratings",
+    "If user asks for historical or specific periods, fetch data accordingly and explain trends.",
+    "If business overview requested, give a 2-3 sentence summary.",
+    "Offer brief business summary when asked (sector, market cap, key products)."
 )
 
-financial_literacy_agent = Agent(
-    name="Financial Literacy Coach",
-    role="Explain finance concepts simply",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    instructions=[
-        "Recognize twisted or colloquial finance questions and map them to core concepts.",
-        "Break down explanations into 3 simple steps, using everyday analogies.",
-        "Explain the concept with a small example in a simple way"
-        "Ask follow-up questions if user context (goal, timeframe) is needed.",
-        "Always conclude with a clear action tip or takeaway.",
-        "Handle multi-turn concept deep dives by retaining context across questions."
-    ],
-    show_tool_calls=False,
-    markdown=True
+LITERACY_INSTRUCTIONS = (
+    "Recognize twisted or colloquial finance questions and map them to core concepts.",
+    "Break down explanations into 3 simple steps, using everyday analogies.",
+    "Explain the concept with a small example in a simple way"
+    "Ask follow-up questions if user context (goal, timeframe) is needed.",
+    "Always conclude with a clear action tip or takeaway.",
+    "Handle multi-turn concept deep dives by retaining context across questions."
 )
 
-
-budget_agent = Agent(
-    name="Budget & Investment Assistant",
-    role="Track income, expenses & investments; support multi‑month summaries",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    tools=[
-        add_transaction,
-        get_budget_summary,
-        get_investment_summary,
-        list_investments,
-        delete_transaction,
-        clear_transactions
-    ],
-    instructions=[
-      # logging
-      "When user says 'I spent', 'I paid', 'I earned', or 'I invested', extract type, amount, category and optional month(s).",
-      "Treat 'invested' exactly like an expense but append 'investment' to category if none given.",
-      "When the user says things like 'Earned', 'spent', 'paid', or 'invested', extract type (expense for spent/invested, income for received), category, amount, and optional period.",
-      "Earned means income",
-      "If the user mentions a period (e.g. ‘in April’, ‘on 2025-04-15’), parse it, then call add_transaction(type, category, amount, date=parsed_date) rather than the old 3-arg call",
-      "If user just says 'I want to invest', ask: 'Sure—what would you like to invest in, and how much?'",
-      "Support natural month names and comma/separated lists (e.g. 'April and May', '2025‑04,2025‑05').",
-      "Convert months to YYYY-MM before calling tools.",
-      "After logging, reply 'Recorded [type] of $X under “[category]” for [month].'",
-
-      # summaries
-      "If user asks 'budget summary' with month(s), call get_budget_summary(months=list).",
-      "If no month given, call get_budget_summary() for all time.",
-      "Return the tool's output exactly—no extra wrapping.",
-
-      # investments
-      "If user asks 'investment summary' or 'show investments', call get_investment_summary().",
-      "If user asks 'list my investments', call list_investments().",
-
-      # delete / clear
-      "If user says 'delete transaction <id>', call delete_transaction(id) and confirm.",
-      "If user says 'clear all transactions' or similar, call clear_transactions() and confirm.",
-
-      # clarifications
-      "If key info (amount, category, or month) is missing or ambiguous, ask a brief follow‑up question."
-    ],
-    show_tool_calls=False,
-    markdown=True
+BUDGET_INSTRUCTIONS = (
+    # logging
+    "When user says 'I spent', 'I paid', 'I earned', or 'I invested', extract type, amount, category and optional month(s).",
+    "Treat 'invested' exactly like an expense but append 'investment' to category if none given.",
+    "When the user says things like 'Earned', 'spent', 'paid', or 'invested', extract type (expense for spent/invested, income for received), category, amount, and optional period.",
+    "Earned means income",
+    "If the user mentions a period (e.g. ‘in April’, ‘on 2025-04-15’), parse it, then call add_transaction(type, category, amount, date=parsed_date) rather than the old 3-arg call",
+    "When the user lists multiple items, call add_transactions(rows) once with all of them instead of add_transaction per item.",
+    "If user just says 'I want to invest', ask: 'Sure—what would you like to invest in, and how much?'",
+    "Support natural month names and comma/separated lists (e.g. 'April and May', '2025‑04,2025‑05').",
+    "Convert months to YYYY-MM before calling tools.",
+    "After logging, reply 'Recorded [type] of $X under “[category]” for [month].'",
+
+    # summaries
+    "If user asks 'budget summary' with month(s), call get_budget_summary(months=list).",
+    "If no month given, call get_budget_summary() for all time.",
+    "Return the tool's output exactly—no extra wrapping.",
+
+    # investments
+    "If user asks 'investment summary' or 'show investments', call get_investment_summary().",
+    "If user asks 'list my investments', call list_investments().",
+
+    # delete / clear
+    "If user says 'delete transaction <id>', call delete_transaction(id) and confirm.",
+    "If user says 'clear all transactions' or similar, call clear_transactions() and confirm.",
+
+    # clarifications
+    "If key info (amount, category, or month) is missing or ambiguous, ask a brief follow‑up question."
 )
 
-
-loan_agent = Agent(
-    name="Loan Coach",
-    role="Advise on debt repayment strategies",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    tools=[calculate_loan_repayment],
-    instructions=[
-        "Extract loan name, balance, rate, min payment from user input",
-        "Extract loan details from varied user inputs (multiple loans, partial info).",
-        "If details are incomplete, ask for missing balances, rates, or min payments.",
-        "Explain both avalanche and snowball methods, then recommend based on user goals.",
-        "When chosen, call calculate_loan_repayment and interpret the table for next steps." 
-        "Explain avalanche vs snowball with pros/cons",
-        "If method specified, call calculate_loan_repayment accordingly; else default to avalanche."  
-    ],
-    show_tool_calls=False,
-    markdown=True
+LOAN_INSTRUCTIONS = (
+    "Extract loan name, balance, rate, min payment from user input",
+    "Extract loan details from varied user inputs (multiple loans, partial info).",
+    "If details are incomplete, ask for missing balances, rates, or min payments.",
+    "Explain both avalanche and snowball methods, then recommend based on user goals.",
+    "When chosen, call calculate_loan_repayment and interpret the table for next steps."
+    "Explain avalanche vs snowball with pros/cons",
+    "If method specified, call calculate_loan_repayment accordingly; else default to avalanche."
 )
 
-credit_score_agent = Agent(
-    name="Credit Score Advisor",
-    role="Educate on credit scores and improvement",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    instructions=[
-        "Answer both general and technical credit score queries, defining terms clearly.",
-        "Tailor tips to user’s situation if they mention debts or payment history.",
-        "Offer short-term and long-term improvement strategies.",
-        "Answer situational questions also"
-        "Handle follow-up questions by recalling prior credit context in the session."
-    ],
-    show_tool_calls=False,
-    markdown=True
+CREDIT_SCORE_INSTRUCTIONS = (
+    "Answer both general and technical credit score queries, defining terms clearly.",
+    "Tailor tips to user’s situation if they mention debts or payment history.",
+    "Offer short-term and long-term improvement strategies.",
+    "Answer situational questions also"
+    "Handle follow-up questions by recalling prior credit context in the session."
 )
 
-general_chat_agent = Agent(
-    name="General Chat Agent",
-    role="Handle greetings and basic fallback queries",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    instructions=[
-        "Handle greetings, small talk, and 'who are you' questions directly.",
-        "For off-topic queries, politely state limitations and suggest finance-related topics.",
-        "If the query hints at a finance request, route to the appropriate specialist agent."
-    ],
-    show_tool_calls=False,
-    markdown=True
+GENERAL_CHAT_INSTRUCTIONS = (
+    "Handle greetings, small talk, and 'who are you' questions directly.",
+    "For off-topic queries, politely state limitations and suggest finance-related topics.",
+    "If the query hints at a finance request, route to the appropriate specialist agent."
 )
 
-financial_planner_agent = Agent(
-    name="Financial Planner",
-    role="Handle DTI, inflation, net worth calculations",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    tools=[dti_ratio, inflation_adjusted_value, calculate_net_worth],
-    instructions=[
-        "Check Carefully what the questions is,which tool is it related to"
-        "If the answer requires 2 or more tools, combine them if needed"
-        "Detect mixed planning requests (e.g., 'net worth and inflation impact') and split into steps.",
-        "Call each relevant tool, then combine results into a cohesive plan.",
-        "Explain numeric outputs in plain language with next-action suggestions."
-    ],
-    show_tool_calls=False,
-    markdown=True
+PLANNER_INSTRUCTIONS = (
+    "Check Carefully what the questions is,which tool is it related to"
+    "If the answer requires 2 or more tools, combine them if needed"
+    "Detect mixed planning requests (e.g., 'net worth and inflation impact') and split into steps.",
+    "Call each relevant tool, then combine results into a cohesive plan.",
+    "Explain numeric outputs in plain language with next-action suggestions."
 )
 
-sentiment_agent = Agent(
-    name="Sentiment Agent",
-    role="Analyze news sentiment",
-    model=Groq(id="llama-3.3-70b-versatile"),
-    tools=[DuckDuckGo(), analyze_sentiment],
-    instructions=[
-        "Fetch the 5 latest headlines about the company via DuckDuckGo",
-        "Call analyze_sentiment(headlines) for overall polarity",
-        "Return headlines list and sentiment summary in plain text"
-        "Give suggestion on if the stock can be buyed or not"
-        "If headlines are unclear or misleading, ask user to clarify topic."
-    ],
-    show_tool_calls=False,
-    markdown=True
+SENTIMENT_INSTRUCTIONS = (
+    "Fetch the 5 latest headlines about the company via DuckDuckGo",
+    "Call analyze_sentiment(headlines) for overall polarity",
+    "Return headlines list and sentiment summary in plain text"
+    "Give suggestion on if the stock can be buyed or not"
+    "If headlines are unclear or misleading, ask user to clarify topic."
 )
 
-# --- Master Agent Team ---------------------------------------------------------
-
-agent_team = Agent(
-    model=Groq(id="llama-3.3-70b-versatile"),
-    team=[
-        web_agent,
-        finance_agent,
-        financial_literacy_agent,
-        budget_agent,
-        loan_agent,
-        credit_score_agent,
-        general_chat_agent,
-        financial_planner_agent,
-        sentiment_agent
-    ],
-    instructions=[
-        "Parse user intent and route to the correct agent:",
-        "- Greetings → General Chat Agent",
-        "First, determine if the question is general, conceptual, transactional, strategic, or data-driven.",
-        "Use General Chat for greetings/fallbacks; Literacy for concepts; Budget for transactions/summaries;",
-        "Loan for debt strategies; Credit Score for scoring advice; Planner for health metrics; Sentiment for news mood;",
-        "Finance for stock/company data; Web for anything else requiring search.",
-        "If user phrasing is unclear or uses slang, ask a brief clarifying question before proceeding.",
-        "Always output a clean, user-friendly answer without exposing internal tool JSON." 
-        "- Finance concepts → Financial Literacy Coach",
-        "- Transactions/summary → Budget Assistant",
-        "- Debt strategies → Loan Coach",
-        "- Credit advice → Credit Score Advisor",
-        "- Planning (DTI, inflation, net worth) → Financial Planner",
-        "- Stock data → Finance Agent",
-        "- News sentiment → Sentiment Agent",
-        "- Otherwise → Web Agent",
-        "Execute any needed tools and return clean, human-readable answers without raw tool JSON."
-    ],
-    show_tool_calls=False,
-    storage=SqlAgentStorage(table_name="agent_team", db_file="agents.db"),
-    add_history_to_messages=True,
-    markdown=True
+TEAM_INSTRUCTIONS = (
+    "Parse user intent and route to the correct agent:",
+    "- Greetings → General Chat Agent",
+    "First, determine if the question is general, conceptual, transactional, strategic, or data-driven.",
+    "Use General Chat for greetings/fallbacks; Literacy for concepts; Budget for transactions/summaries;",
+    "Loan for debt strategies; Credit Score for scoring advice; Planner for health metrics; Sentiment for news mood;",
+    "Finance for stock/company data; Web for anything else requiring search.",
+    "If user phrasing is unclear or uses slang, ask a brief clarifying question before proceeding.",
+    "Always output a clean, user-friendly answer without exposing internal tool JSON."
+    "- Finance concepts → Financial Literacy Coach",
+    "- Transactions/summary → Budget Assistant",
+    "- Debt strategies → Loan Coach",
+    "- Credit advice → Credit Score Advisor",
+    "- Planning (DTI, inflation, net worth) → Financial Planner",
+    "- Stock data → Finance Agent",
+    "- News sentiment → Sentiment Agent",
+    "- Otherwise → Web Agent",
+    "Execute any needed tools and return clean, human-readable answers without raw tool JSON."
 )
+
+# --- Agents --------------------------------------------------------------------------------
+
+def build_agent_team() -> Agent:
+    """
+    Construct the specialist agents and the master team that routes between them.
+    """
+    from dotenv import load_dotenv
+    from phi.model.groq import Groq
+    from phi.tools.duckduckgo import DuckDuckGo
+    from phi.tools.yfinance import YFinanceTools
+    from phi.storage.agent.sqlite import SqlAgentStorage
+
+    # Load environment variables
+    load_dotenv()
+
+    web_agent = Agent(
+        name="Web Agent",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        tools=[DuckDuckGo()],
+        instructions=list(WEB_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+    finance_agent = Agent(
+        name="Finance Agent",
+        role="Get stock prices and analyst recommendations",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        tools=[YFinanceTools(stock_price=True, analyst_recommendations=True, company_info=True)],
+        instructions=list(FINANCE_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+    financial_literacy_agent = Agent(
+        name="Financial Literacy Coach",
+        role="Explain finance concepts simply",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        instructions=list(LITERACY_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+
+    budget_agent = Agent(
+        name="Budget & Investment Assistant",
+        role="Track income, expenses & investments; support multi‑month summaries",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        tools=[
+            add_transaction,
+            add_transactions,
+            get_budget_summary,
+            get_investment_summary,
+            list_investments,
+            delete_transaction,
+            clear_transactions
+        ],
+        instructions=list(BUDGET_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+
+    loan_agent = Agent(
+        name="Loan Coach",
+        role="Advise on debt repayment strategies",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        tools=[calculate_loan_repayment],
+        instructions=list(LOAN_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+    credit_score_agent = Agent(
+        name="Credit Score Advisor",
+        role="Educate on credit scores and improvement",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        instructions=list(CREDIT_SCORE_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+    general_chat_agent = Agent(
+        name="General Chat Agent",
+        role="Handle greetings and basic fallback queries",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        instructions=list(GENERAL_CHAT_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+    financial_planner_agent = Agent(
+        name="Financial Planner",
+        role="Handle DTI, inflation, net worth calculations",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        tools=[dti_ratio, inflation_adjusted_value, calculate_net_worth],
+        instructions=list(PLANNER_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+    sentiment_agent = Agent(
+        name="Sentiment Agent",
+        role="Analyze news sentiment",
+        model=Groq(id="llama-3.3-70b-versatile"),
+        tools=[DuckDuckGo(), analyze_sentiment],
+        instructions=list(SENTIMENT_INSTRUCTIONS),
+        show_tool_calls=False,
+        markdown=True
+    )
+
+    # --- Master Agent Team ---------------------------------------------------------
+
+    agent_team = Agent(
+        model=Groq(id="llama-3.3-70b-versatile"),
+        team=[
+            web_agent,
+            finance_agent,
+            financial_literacy_agent,
+            budget_agent,
+            loan_agent,
+            credit_score_agent,
+            general_chat_agent,
+            financial_planner_agent,
+            sentiment_agent
+        ],
+        instructions=list(TEAM_INSTRUCTIONS),
+        show_tool_calls=False,
+        storage=SqlAgentStorage(table_name="agent_team", db_file="agents.db"),
+        add_history_to_messages=True,
+        markdown=True
+    )
+    return agent_team